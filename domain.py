@@ -1,31 +1,111 @@
 #!/usr/bin/env python3  # Shebang for Linux users to run the script directly
 
+import argparse
+import os
+import signal
 import subprocess
+import asyncio
+import io
+import heapq
+import itertools
+import sqlite3
+import sys
+import threading
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+import aiodns  # c-ares based resolver for concurrent subdomain brute-forcing
 import dns.resolver  # For subdomain discovery
-import pyfiglet
+import ijson
 import requests
+import requests_cache
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import re
 import time
+from contextlib import closing
+try:
+    import psycopg2  # Optional: direct SQL access to crt.sh
+except ImportError:
+    psycopg2 = None
 
 # Subdomain enumeration techniques: known subdomains and crt.sh API.
-known_subdomains = ['www', 'ftp', 'mail', 'blog', 'dev', 'api', 'shop', 'm', 'web', 'app', 'news', 'test']
+known_subdomains = frozenset(['www', 'ftp', 'mail', 'blog', 'dev', 'api', 'shop', 'm', 'web', 'app', 'news', 'test'])
+
+# crt.sh responses are cached on disk so re-runs for the same domain skip the network
+# and cache misses reuse a keep-alive connection pool with gzip transfer
+CRT_SH_CACHE_FILE = 'crtsh.sqlite'
+CRT_SH_CACHE_EXPIRY = 3600  # Seconds
+_SESSION = requests_cache.CachedSession(CRT_SH_CACHE_FILE, expire_after=CRT_SH_CACHE_EXPIRY)
+_SESSION.headers.update({'Accept-Encoding': 'gzip'})
+_SESSION.mount('https://', HTTPAdapter(pool_connections=10, pool_maxsize=10,
+                                       max_retries=Retry(total=2, backoff_factor=0.3)))
+
+# Seconds an external tool may run before it is killed
+TOOL_TIMEOUT = 300
+
+# Once crt.sh finds this many subdomains, Sublist3r and Amass rarely add enough to be worth running
+EARLY_EXIT_THRESHOLD = 500
+
+# DISTINCT runs on crt.sh, so only unique names cross the wire rather than one row per certificate
+CRT_SH_QUERY = """
+    SELECT DISTINCT lower(name_value)
+    FROM certificate_and_identities
+    WHERE plainto_tsquery('certwatch', %s) @@ identities(certificate)
+      AND (lower(name_value) = lower(%s) OR name_value ILIKE %s)
+"""
+
+# Seconds crt.sh may spend on the query before it is cancelled and the JSON API is used instead
+CRT_SH_STATEMENT_TIMEOUT = 60
+
+# 'sudo su' ASCII art, pre-rendered with pyfiglet's "slant" font
+_BANNER = """\
+                   __                   
+   _______  ______/ /___     _______  __
+  / ___/ / / / __  / __ \\   / ___/ / / /
+ (__  ) /_/ / /_/ / /_/ /  (__  ) /_/ / 
+/____/\\__,_/\\__,_/\\____/  /____/\\__,_/  
+                                        
+"""
+
+# Public resolvers to query, in order; a server that times out is moved to the back
+NAMESERVERS = ['8.8.8.8', '8.8.4.4', '1.1.1.1']
+DNS_RETRIES = 3
+
+# Brute-force lookups are spread round-robin over these resolvers so no single
+# operator's rate limit caps throughput (Google's resolvers throttle bulk clients)
+RESOLVERS = ['1.1.1.1', '1.0.0.1', '9.9.9.9', '149.112.112.112', '208.67.222.222', '208.67.220.220']
+
+# Record types probed for each brute-forced candidate
+RECORD_TYPES = ('A', 'AAAA', 'CNAME')
 
 def print_sudo_su_logo():
-    """Generate and display the 'sudo su' logo using pyfiglet"""
-    ascii_art = pyfiglet.figlet_format("sudo su", font="slant")  # 'sudo su' ASCII art
-    print(ascii_art)
+    """Display the 'sudo su' logo"""
+    print(_BANNER)
+
+def _rotate_nameservers(resolver):
+    """Move the first nameserver to the back so the next attempt goes to another server"""
+    resolver.nameservers = resolver.nameservers[1:] + resolver.nameservers[:1]
+
+def _resolve_with_retry(resolver, name, rdtype):
+    """Resolve a name, retrying against the next nameserver on timeout"""
+    for attempt in range(DNS_RETRIES):
+        try:
+            return resolver.resolve(name, rdtype)
+        except dns.resolver.LifetimeTimeout:
+            if attempt == DNS_RETRIES - 1:
+                raise
+            _rotate_nameservers(resolver)
 
 def get_subdomains(domain):
     """Get subdomains of the domain using DNS resolver"""
     subdomains = set()  # Using a set to avoid duplicate entries
     resolver = dns.resolver.Resolver()
-    resolver.nameservers = ['8.8.8.8', '8.8.4.4']  # Use Google's public DNS
-    resolver.timeout = 10  # Timeout after 10 seconds
-    resolver.lifetime = 10  # Set lifetime to 10 seconds
+    resolver.nameservers = list(NAMESERVERS)
+    resolver.timeout = 2  # Timeout after 2 seconds
+    resolver.lifetime = 3  # Set lifetime to 3 seconds
     
     try:
         # Query DNS for subdomains of the main domain
-        answers = resolver.resolve(domain, 'A')
+        answers = _resolve_with_retry(resolver, domain, 'A')
         for answer in answers:
             subdomains.add(domain)
     except (dns.resolver.NoAnswer, dns.resolver.NXDOMAIN):
@@ -35,49 +115,146 @@ def get_subdomains(domain):
     
     return subdomains
 
-def brute_force_subdomains(domain):
-    """Brute-force known subdomains for a domain"""
-    subdomains = set()
-    for sub in known_subdomains:
-        full_domain = f"{sub}.{domain}"
-        try:
-            # Attempt DNS resolution for each known subdomain
-            dns.resolver.resolve(full_domain, 'A')
-            subdomains.add(full_domain)
-        except (dns.resolver.NoAnswer, dns.resolver.NXDOMAIN):
-            pass  # Skip if subdomain doesn't exist
-        except dns.resolver.LifetimeTimeout:
+def brute_force_subdomains(domain, max_concurrency=50):
+    """Brute-force known subdomains for a domain, at most max_concurrency lookups at a time"""
+    async def _lookup(resolver, sem, full_domain, rdtype):
+        async with sem:
+            # Cap each lookup at 3 seconds in total, like the resolver lifetime in get_subdomains
+            return await asyncio.wait_for(resolver.query(full_domain, rdtype), timeout=3)
+
+    async def _probe(resolver, sem, full_domain):
+        # Query every record type at once; any answer means the subdomain exists
+        lookups = [_lookup(resolver, sem, full_domain, rdtype) for rdtype in RECORD_TYPES]
+        results = await asyncio.gather(*lookups, return_exceptions=True)
+        if any(not isinstance(r, Exception) for r in results):
+            return full_domain
+        if any(isinstance(r, asyncio.TimeoutError) or
+               (isinstance(r, aiodns.error.DNSError) and r.args[0] == aiodns.error.ARES_ETIMEOUT)
+               for r in results):
             print(f"DNS timeout while checking {full_domain}.")
-            continue
-    return subdomains
+        return None  # Skip if subdomain doesn't exist
+
+    async def _probe_all():
+        # One resolver per server with the next server as its only fallback;
+        # c-ares moves on to the fallback itself after a 2 second timeout
+        resolvers = [aiodns.DNSResolver(nameservers=[server, RESOLVERS[(i + 1) % len(RESOLVERS)]],
+                                        timeout=2, tries=1)
+                     for i, server in enumerate(RESOLVERS)]
+        # Resolve all candidates concurrently instead of one after another,
+        # capping in-flight queries so large lists don't stall the resolver
+        sem = asyncio.Semaphore(max_concurrency)
+        probes = [_probe(resolvers[i % len(resolvers)], sem, f"{sub}.{domain}")
+                  for i, sub in enumerate(known_subdomains)]
+        return await asyncio.gather(*probes, return_exceptions=True)
+
+    results = asyncio.run(_probe_all())
+    return {r for r in results if isinstance(r, str)}
 
 def get_crt_sh_subdomains(domain):
-    """Use crt.sh API to find subdomains by checking certificates"""
+    """Use crt.sh to find subdomains by checking certificates"""
+    if psycopg2 is not None:
+        subdomains = _load_cached_sql_subdomains(domain)
+        if subdomains is not None:
+            return subdomains
+        try:
+            subdomains = _get_crt_sh_sql_subdomains(domain)
+        except psycopg2.Error as e:
+            print(f"Error querying crt.sh database for {domain}, falling back to the JSON API: {e}")
+        else:
+            _store_cached_sql_subdomains(domain, subdomains)
+            return subdomains
+    return _get_crt_sh_json_subdomains(domain)
+
+def _open_sql_cache():
+    """Open the crt.sh cache file, alongside the HTTP response cache, creating the SQL results table"""
+    db = sqlite3.connect(CRT_SH_CACHE_FILE, timeout=10)
+    db.execute("CREATE TABLE IF NOT EXISTS crt_sh_sql (domain TEXT PRIMARY KEY, names TEXT, expires REAL)")
+    return db
+
+def _load_cached_sql_subdomains(domain):
+    """Return the crt.sh database results cached for a domain, or None if missing or expired"""
+    with closing(_open_sql_cache()) as db:
+        row = db.execute("SELECT names FROM crt_sh_sql WHERE domain = ? AND expires > ?",
+                         (domain, time.time())).fetchone()
+    if row is None:
+        return None
+    return set(row[0].split('\n')) if row[0] else set()
+
+def _store_cached_sql_subdomains(domain, subdomains):
+    """Cache crt.sh database results for a domain for CRT_SH_CACHE_EXPIRY seconds"""
+    with closing(_open_sql_cache()) as db:
+        db.execute("INSERT OR REPLACE INTO crt_sh_sql VALUES (?, ?, ?)",
+                   (domain, '\n'.join(subdomains), time.time() + CRT_SH_CACHE_EXPIRY))
+        db.commit()
+
+def _get_crt_sh_sql_subdomains(domain):
+    """Query crt.sh's public PostgreSQL endpoint, letting the server deduplicate names"""
+    subdomains = set()
+    conn = psycopg2.connect(host='crt.sh', port=5432, user='guest', dbname='certwatch', connect_timeout=3,
+                            options=f'-c statement_timeout={CRT_SH_STATEMENT_TIMEOUT * 1000}')
+    try:
+        # A named (server-side) cursor streams rows in batches of itersize
+        with conn.cursor(name='crtsh') as cur:
+            cur.itersize = 10000
+            cur.execute(CRT_SH_QUERY, (domain, domain, f'%.{domain}'))
+            subdomains.update(row[0] for row in cur)
+    finally:
+        conn.close()
+    return subdomains
+
+def _get_crt_sh_json_subdomains(domain):
+    """Use crt.sh JSON API to find subdomains by checking certificates"""
     url = f"https://crt.sh/?q=%25.{domain}&output=json"
+    suffix = '.' + domain  # Match names under the domain, not lookalikes like evilexample.com
     subdomains = set()
     
     try:
-        response = requests.get(url)
-        if response.status_code == 200:
-            data = response.json()
-            for cert in data:
-                subdomain = cert['name_value']
-                # Extract subdomains by splitting at commas
-                subdomains.update([s.strip() for s in subdomain.split(',') if domain in s])
-        else:
-            print(f"Error fetching crt.sh data for {domain}")
-    except requests.exceptions.RequestException as e:
+        with _SESSION.get(url, timeout=(3, 30)) as response:
+            if response.status_code == 200:
+                # The cache keeps the whole body in memory anyway (and a cached response.raw
+                # can't be re-read), so parse from content; ijson still yields one cert at a
+                # time rather than building the full list of dicts
+                certs = ijson.items(io.BytesIO(response.content), 'item')
+                # crt.sh separates the names on a certificate with newlines; chained
+                # generators feed set.update directly without building per-cert lists
+                names = (s.strip() for cert in certs for s in cert['name_value'].split('\n'))
+                subdomains.update(s for s in names if s == domain or s.endswith(suffix))
+            else:
+                print(f"Error fetching crt.sh data for {domain}")
+    except (requests.exceptions.RequestException, ijson.JSONError) as e:
         print(f"Error querying crt.sh for {domain}: {e}")
     
     return subdomains
 
+def _kill_process_group(proc, timeout):
+    """Kill a tool that ran past its timeout, along with any children it spawned"""
+    print(f"{proc.args[0]} timed out after {timeout}s, keeping partial results")
+    try:
+        os.killpg(proc.pid, signal.SIGKILL)
+    except ProcessLookupError:
+        pass  # Finished just as the timer fired
+
+def _stream_tool_output(cmd, timeout=TOOL_TIMEOUT):
+    """Run an external tool and collect its stdout line by line into a set"""
+    # A new session puts the tool and its children in their own process group
+    with subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True, bufsize=1,
+                          start_new_session=True) as proc:
+        # Killing the group closes stdout, which ends the loop with what was read so far.
+        # The timer stays armed until the tool has exited, in case it closes stdout early
+        timer = threading.Timer(timeout, _kill_process_group, (proc, timeout))
+        timer.start()
+        try:
+            subdomains = {line.strip() for line in proc.stdout if line.strip()}
+            proc.wait()
+        finally:
+            timer.cancel()
+    return subdomains
+
 def run_sublist3r(domain):
     """Run Sublist3r tool to discover subdomains"""
     print("Running Sublist3r for subdomain enumeration...")
     try:
-        result = subprocess.run(["python3", "Sublist3r/sublist3r.py", "-d", domain], capture_output=True, text=True)
-        subdomains = set(result.stdout.splitlines())
-        return subdomains
+        return _stream_tool_output(["python3", "Sublist3r/sublist3r.py", "-d", domain])
     except Exception as e:
         print(f"Error running Sublist3r: {e}")
         return set()
@@ -86,9 +263,7 @@ def run_amass(domain):
     """Run Amass tool to discover subdomains"""
     print("Running Amass for subdomain enumeration...")
     try:
-        result = subprocess.run(["amass", "enum", "-d", domain], capture_output=True, text=True)
-        subdomains = set(result.stdout.splitlines())
-        return subdomains
+        return _stream_tool_output(["amass", "enum", "-d", domain])
     except Exception as e:
         print(f"Error running Amass: {e}")
         return set()
@@ -97,52 +272,70 @@ def run_assetfinder(domain):
     """Run Assetfinder tool to discover subdomains"""
     print("Running Assetfinder for subdomain enumeration...")
     try:
-        result = subprocess.run(["./assetfinder", "--subs", domain], capture_output=True, text=True)
-        subdomains = set(result.stdout.splitlines())
-        return subdomains
+        return _stream_tool_output(["./assetfinder", "--subs", domain])
     except Exception as e:
         print(f"Error running Assetfinder: {e}")
         return set()
 
-def analyze_domain_and_subdomains(domain):
+def analyze_domain_and_subdomains(domain, exhaustive=False):
     """Analyze the given domain and its subdomains"""
     print(f"\nAnalyzing domain and subdomains for {domain}...")
 
-    # Get subdomains from DNS resolution of main domain
-    subdomains = get_subdomains(domain)
-
-    # Brute-force common subdomains
-    subdomains.update(brute_force_subdomains(domain))
-
-    # Get subdomains from crt.sh
-    subdomains.update(get_crt_sh_subdomains(domain))
-
-    # Run Sublist3r for deeper enumeration
-    subdomains.update(run_sublist3r(domain))
-
-    # Run Amass for deeper enumeration
-    subdomains.update(run_amass(domain))
-
-    # Run Assetfinder for deeper enumeration
-    subdomains.update(run_assetfinder(domain))
+    # Every source is independent and I/O-bound, so run them all at once. Sublist3r and
+    # Amass are slow, so unless exhaustive they only start once crt.sh has come up short
+    sources = [get_subdomains, brute_force_subdomains, get_crt_sh_subdomains, run_assetfinder]
+    slow_sources = [run_sublist3r, run_amass]
+    max_workers = len(sources) + len(slow_sources)
+    if exhaustive:
+        sources = sources + slow_sources
+    sorted_sources = []
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        pending = {executor.submit(source, domain): source for source in sources}
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                source = pending.pop(future)
+                # Sort each source as soon as it finishes rather than the combined set at the end
+                sorted_sources.append(sorted(future.result()))
+                if source is not get_crt_sh_subdomains or exhaustive:
+                    continue
+                crt_sh_count = len(sorted_sources[-1])
+                if crt_sh_count < EARLY_EXIT_THRESHOLD:
+                    pending.update({executor.submit(slow, domain): slow for slow in slow_sources})
+                else:
+                    print(f"crt.sh returned {crt_sh_count} subdomains, skipping Sublist3r and Amass "
+                          "(use --exhaustive to run them anyway)")
 
     # Output the main domain
     print(f"Main domain: {domain}")
 
     # Output the subdomains
-    if subdomains:
+    if any(sorted_sources):
         print("\nSubdomains found:")
-        for sub in sorted(subdomains):
-            print(f"- {sub}")
+        # Merged lists keep duplicates next to each other, so groupby drops them;
+        # the whole listing is then written in one call instead of a print per name
+        merged = (sub for sub, _ in itertools.groupby(heapq.merge(*sorted_sources)))
+        sys.stdout.write("\n".join(f"- {sub}" for sub in merged) + "\n")
     else:
         print("No subdomains found.")
 
 # Main script execution
 if __name__ == "__main__":
+    try:
+        import uvloop  # Optional: faster event loop for the DNS brute-force
+        uvloop.install()
+    except ImportError:
+        pass
+
     print_sudo_su_logo()  # Display the custom "sudo su" ASCII art
 
+    parser = argparse.ArgumentParser(description="Find subdomains of a domain")
+    parser.add_argument("--exhaustive", action="store_true",
+                        help="always run Sublist3r and Amass, even when crt.sh already found plenty")
+    args = parser.parse_args()
+
     # Ask for domain input from the user
     domain_input = input("Enter a domain to check for subdomains (e.g., example.com): ")
 
     # Call the function to find subdomains of the domain
-    analyze_domain_and_subdomains(domain_input)
\ No newline at end of file
+    analyze_domain_and_subdomains(domain_input, exhaustive=args.exhaustive)
\ No newline at end of file